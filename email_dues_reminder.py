@@ -23,12 +23,14 @@ KB7APU,LOREN,FLINDT,morsnow@q.com,2024-12-03
 import argparse
 import csv
 from email_utils import initialize_notifications, read_template, read_smtp_credentials, send_email, write_notification
+from email_utils import read_suppressions, resolve_recipient
 
 EXPIRATION_FIELDS = ['call', 'first', 'last', 'email', 'alt_email', 'expiry', 'level', 'flag']
 REMOVE_FIELDS = ['alt_email', 'level', 'flag']
 NOTIFICATION_FIELDS = ['call', 'first', 'last', 'email', 'expiry'] + ['id', 'sent']
 SMTP_SERVER = 'smtp.gmail.com'
 SMTP_CREDENTIALS = 'smtp_credentials.txt'
+SUPPRESSIONS = 'suppressions.csv'
 FROM = 'wwarasecretary@gmail.com'
 
 
@@ -77,6 +79,8 @@ def main():
       description='Sends emails to expiring entries using the template and appends to notifications.')
     parser.add_argument('--send_emails', help='Disable dry_run and actually send emails.',
                         action='store_true')
+    parser.add_argument('--suppressions', help='CSV file of bounced addresses to skip or redirect',
+                        default=SUPPRESSIONS)
     parser.add_argument('expiring', help='CSV file with upcoming expirations')
     parser.add_argument('notifications', help='CSV file of already posted notifications')
     parser.add_argument('template', help='Text file with Python Template syntax')
@@ -87,6 +91,7 @@ def main():
     notifications = read_notifications(args.notifications)
     template = read_template(args.template)
     credentials = read_smtp_credentials(args.credentials)
+    suppressions = read_suppressions(args.suppressions)
     print(f"Credentials: {credentials}")
 
     for record in expiring:
@@ -97,6 +102,10 @@ def main():
             continue
 
         print(f"{record['id']} not in notifications")
+        email = resolve_recipient(record['email'], suppressions)
+        if email is None:
+            continue
+        record['email'] = email
         if send_email(template, record, SMTP_SERVER, credentials, FROM, args.send_emails):
             write_notification(args.notifications, record, NOTIFICATION_FIELDS)
 
@@ -28,6 +28,7 @@ import argparse
 import csv
 import datetime
 from email_utils import initialize_notifications, read_template, read_smtp_credentials, send_email, write_notification
+from email_utils import read_suppressions, resolve_recipient
 
 EXPIRY_WINDOW = datetime.timedelta(days=92)
 EXPIRATION_FIELDS = ['outfreq', 'infreq', 'tone', 'access', 'stationloc', 'areaserve', 'stn',
@@ -35,6 +36,7 @@ EXPIRATION_FIELDS = ['outfreq', 'infreq', 'tone', 'access', 'stationloc', 'areas
 NOTIFICATION_FIELDS = EXPIRATION_FIELDS + ['id', 'sent']
 SMTP_SERVER = 'smtp.gmail.com'
 SMTP_CREDENTIALS = 'smtp_credentials.txt'
+SUPPRESSIONS = 'suppressions.csv'
 FROM = 'wwarasecretary@gmail.com'
 
 
@@ -84,6 +86,8 @@ def main():
       description='Sends emails to expiring entries using the template and appends to notifications.')
     parser.add_argument('--send_emails', help='Disable dry_run and actually send emails.',
                         action='store_true')
+    parser.add_argument('--suppressions', help='CSV file of bounced addresses to skip or redirect',
+                        default=SUPPRESSIONS)
     parser.add_argument('expiring', help='CSV file with upcoming expirations')
     parser.add_argument('notifications', help='CSV file of already posted notifications')
     parser.add_argument('template', help='Text file with Python Template syntax')
@@ -94,6 +98,7 @@ def main():
     notifications = read_notifications(args.notifications)
     template = read_template(args.template)
     credentials = read_smtp_credentials(args.credentials)
+    suppressions = read_suppressions(args.suppressions)
     print(f"Credentials: {credentials}")
     now = datetime.datetime.now()
 
@@ -119,6 +124,10 @@ def main():
                     continue
             else:
                 print(f"{record['id']} not in notifications")
+            email = resolve_recipient(record['email'], suppressions)
+            if email is None:
+                continue
+            record['email'] = email
             if send_email(template, record, SMTP_SERVER, credentials, FROM, args.send_emails):
                 write_notification(args.notifications, record, NOTIFICATION_FIELDS)
 
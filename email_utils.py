@@ -6,13 +6,17 @@ email-utils.py - common routines to WWARA email tools
 
 Use this import line to utilize this file:
 from email_utils import initialize_notifications, read_template, read_smtp_credentials, send_email, write_notification
+from email_utils import read_suppressions, resolve_recipient, write_suppression
 '''
 
 import csv
 import datetime
+import os
 import smtplib
 from string import Template
 
+SUPPRESSION_FIELDS = ['email', 'call', 'alt_email', 'status', 'diagnostic', 'bounced']
+
 def initialize_notifications(file, fieldnames):
     '''Create the notifications file and write out the header line.'''
     with open(file, 'a', newline='\n') as csvfile:
@@ -63,3 +67,44 @@ def write_notification(file, record, fieldnames):
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
         writer.writerow(record)
     print(f"Wrote record for {record['id']} to {file}")
+
+def read_suppressions(file):
+    '''Read the suppression list of hard bounced addresses, and return a dictionary
+       keyed on the lower cased address.  A missing file is an empty suppression list.
+    '''
+    suppressions = {}
+
+    print(f"Reading suppressions from {file}")
+    try:
+        with open(file) as csvfile:
+            reader = csv.DictReader(csvfile)
+            for record in reader:
+                suppressions[record['email'].lower()] = record
+        print(f"Read {len(suppressions)} suppressed addresses from {file}")
+    except FileNotFoundError:
+        print(f"No suppression file {file}")
+    return suppressions
+
+def write_suppression(file, record):
+    '''Append a single entry to the suppression file, creating it if needed.'''
+    if not os.path.exists(file):
+        initialize_notifications(file, SUPPRESSION_FIELDS)
+    with open(file, 'a', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=SUPPRESSION_FIELDS)
+        writer.writerow(record)
+    print(f"Suppressed {record['email']} ({record['call']}) in {file}")
+
+def resolve_recipient(email, suppressions):
+    '''Return the address to send to, or None if the recipient should be skipped.
+       A suppressed address is redirected to the member's alternate address
+       recorded with the bounce, provided that one has not bounced as well.
+    '''
+    suppression = suppressions.get(email.lower())
+    if suppression is None:
+        return email
+    alt_email = suppression['alt_email']
+    if alt_email and alt_email.lower() not in suppressions:
+        print(f"{email} bounced on {suppression['bounced']}, redirecting to {alt_email}")
+        return alt_email
+    print(f"{email} bounced on {suppression['bounced']}, skipping")
+    return None
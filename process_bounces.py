@@ -0,0 +1,120 @@
+#!/usr/bin/python3
+
+# pylint: disable=locally-disabled, line-too-long, unspecified-encoding
+'''
+process_bounces.py - record hard bounced addresses so the mailers stop sending to them
+
+Usage: (see below)
+
+Reads a local mbox file or maildir directory (e.g. an export of the wwarasecretary
+mailbox), finds the delivery status notifications (RFC 3464) for permanent failures,
+matches the failed address to a member via the Email or Alt Email fields of the
+members file, and appends any newly bounced address to the suppression file.
+Messages that are not bounces (such as replies) are ignored.
+
+Sample output for suppression file
+email,call,alt_email,status,diagnostic,bounced
+morsnow@q.com,KB7APU,,5.1.1,smtp; 550 5.1.1 User unknown,2024-12-04
+
+'''
+
+import argparse
+from datetime import date
+from email.utils import parsedate_to_datetime
+import mailbox
+import os
+from email_utils import read_suppressions, write_suppression
+from member_utils import Members
+
+MEMBERS = 'Members.csv'
+SUPPRESSIONS = 'suppressions.csv'
+
+
+def open_mailbox(path):
+    '''Open a maildir directory or an mbox file without creating it.'''
+    if os.path.isdir(path):
+        return mailbox.Maildir(path, factory=None, create=False)
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f'No mbox file or maildir {path}')
+    return mailbox.mbox(path, factory=None, create=False)
+
+def bounce_date(message):
+    '''Return the date of the bounce message in ISO format, or today if it has no usable Date.'''
+    try:
+        return parsedate_to_datetime(message['Date']).date().isoformat()
+    except (TypeError, ValueError):
+        return date.today().isoformat()
+
+def parse_dsn(message):
+    '''Return a list of (address, status, diagnostic) tuples for the permanently failed
+       recipients in a delivery status notification.  Other messages return an empty list.
+    '''
+    failures = []
+    if message.get_content_type() != 'multipart/report':
+        return failures
+    for part in message.walk():
+        if part.get_content_type() != 'message/delivery-status':
+            continue
+        # The first block holds the per-message fields, the rest are per-recipient.
+        for block in part.get_payload()[1:]:
+            action = (block.get('Action') or '').strip().lower()
+            status = (block.get('Status') or '').strip()
+            recipient = block.get('Final-Recipient') or block.get('Original-Recipient') or ''
+            if action != 'failed' or not status.startswith('5'):
+                continue
+            address = recipient.split(';', 1)[-1].strip().strip('<>')
+            if address:
+                diagnostic = ' '.join((block.get('Diagnostic-Code') or '').split())
+                failures.append((address, status, diagnostic))
+    return failures
+
+def index_addresses(members):
+    '''Map each lower cased member address to the member callsign and the member's other address.'''
+    addresses = {}
+    for call, record in members.members.items():
+        email = record.get('Email', '').strip()
+        alt_email = record.get('Alt Email', '').strip()
+        if alt_email:
+            addresses[alt_email.lower()] = (call, email)
+        if email:
+            addresses[email.lower()] = (call, alt_email)
+    return addresses
+
+def main():
+    '''Main program.'''
+
+    parser = argparse.ArgumentParser(
+      description='Scan a mailbox for bounces and add the failed addresses to the suppression file.')
+    parser.add_argument('--dryrun', help='Disable actually updating the suppression file.',
+                        action='store_true')
+    parser.add_argument('--members', help='CSV file with member records', default=MEMBERS)
+    parser.add_argument('--suppressions', help='CSV file of suppressed addresses', default=SUPPRESSIONS)
+    parser.add_argument('mailboxes', nargs='+', help='mbox files or maildir directories to scan')
+    args = parser.parse_args()
+
+    members = Members(args.members)
+    addresses = index_addresses(members)
+    suppressions = read_suppressions(args.suppressions)
+
+    for path in args.mailboxes:
+        print(f"Processing {path}")
+        scanned = 0
+        for message in open_mailbox(path):
+            scanned += 1
+            for address, status, diagnostic in parse_dsn(message):
+                if address.lower() in suppressions:
+                    continue
+                call, alt_email = addresses.get(address.lower(), ('', ''))
+                if not call:
+                    print(f"  Bounce for {address} does not match any member")
+                record = {'email': address, 'call': call, 'alt_email': alt_email,
+                          'status': status, 'diagnostic': diagnostic,
+                          'bounced': bounce_date(message)}
+                suppressions[address.lower()] = record
+                if args.dryrun:
+                    print(f'  write_suppression dryrun: {record}')
+                    continue
+                write_suppression(args.suppressions, record)
+        print(f"Scanned {scanned} messages in {path}")
+
+main()